@@ -1,10 +1,47 @@
+import heapq
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+try:
+    import simdjson
+    _simdjson_parser = simdjson.Parser()
+except ImportError:
+    simdjson = None
+    _simdjson_parser = None
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import date, datetime
+from operator import itemgetter
 from typing import List, Dict, Type
+import shlex
 import sys
 
 
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _total_value(prices, qtys, n):
+        # Fused multiply+sum: one pass, no prices*qtys temporary.
+        s = 0.0
+        for i in range(n):
+            s += prices[i] * qtys[i]
+        return s
+else:
+    _total_value = None
+
+
 # --- Custom Exceptions ---
 class InventoryError(Exception): pass
 
@@ -16,23 +53,37 @@ class InvalidProductDataError(InventoryError): pass
 
 # --- Abstract Base Product ---
 class Product(ABC):
+    __slots__ = ("_product_id", "_name", "_price", "_quantity_in_stock", "_str_cache")
+
     def __init__(self, product_id: str, name: str, price: float, quantity_in_stock: int):
         self._product_id = product_id
         self._name = name
         self._price = price
         self._quantity_in_stock = quantity_in_stock
+        self._str_cache = None
 
     def restock(self, amount: int):
         self._quantity_in_stock += amount
+        self._str_cache = None
 
     def sell(self, quantity: int):
         if quantity > self._quantity_in_stock:
             raise InsufficientStockError(f"Not enough stock for {self._name}. Available: {self._quantity_in_stock}")
         self._quantity_in_stock -= quantity
+        self._str_cache = None
 
     def get_total_value(self):
         return self._price * self._quantity_in_stock
 
+    def _base_dict(self):
+        return {
+            "type": type(self).__name__,
+            "product_id": self._product_id,
+            "name": self._name,
+            "price": self._price,
+            "quantity": self._quantity_in_stock
+        }
+
     @abstractmethod
     def to_dict(self): pass
 
@@ -45,103 +96,180 @@ class Product(ABC):
 
 
 # --- Subclasses of Product ---
+# C-level batch key fetches for the from_dict hot paths.
+_GET_ELECTRONICS = itemgetter("product_id", "name", "price", "quantity", "brand", "warranty_years")
+_GET_GROCERY = itemgetter("product_id", "name", "price", "quantity", "expiry_date")
+_GET_CLOTHING = itemgetter("product_id", "name", "price", "quantity", "size", "material")
+
+
 class Electronics(Product):
+    __slots__ = ("brand", "warranty_years")
+
     def __init__(self, product_id, name, price, quantity, brand, warranty_years):
-        super().__init__(product_id, name, price, quantity)
-        self.brand = brand
+        # Base-class assignments inlined to skip the super() call on bulk loads.
+        self._product_id = product_id
+        self._name = name
+        self._price = price
+        self._quantity_in_stock = quantity
+        self._str_cache = None
+        self.brand = sys.intern(brand)
         self.warranty_years = warranty_years
 
     def __str__(self):
-        return super().__str__() + f", Brand: {self.brand}, Warranty: {self.warranty_years} yrs"
+        if self._str_cache is None:
+            self._str_cache = super().__str__() + f", Brand: {self.brand}, Warranty: {self.warranty_years} yrs"
+        return self._str_cache
 
     def to_dict(self):
-        return {
-            "type": "Electronics",
-            "product_id": self._product_id,
-            "name": self._name,
-            "price": self._price,
-            "quantity": self._quantity_in_stock,
-            "brand": self.brand,
-            "warranty_years": self.warranty_years
-        }
+        d = self._base_dict()
+        d["brand"] = self.brand
+        d["warranty_years"] = self.warranty_years
+        return d
 
     @classmethod
     def from_dict(cls, data):
-        return cls(data["product_id"], data["name"], data["price"], data["quantity"], data["brand"], data["warranty_years"])
+        return cls(*_GET_ELECTRONICS(data))
 
 
 class Grocery(Product):
+    __slots__ = ("expiry_date",)
+
     def __init__(self, product_id, name, price, quantity, expiry_date):
-        super().__init__(product_id, name, price, quantity)
-        self.expiry_date = datetime.strptime(expiry_date, "%Y-%m-%d").date()
+        self._product_id = product_id
+        self._name = name
+        self._price = price
+        self._quantity_in_stock = quantity
+        self._str_cache = None
+        try:
+            self.expiry_date = date.fromisoformat(expiry_date)
+        except ValueError:
+            self.expiry_date = datetime.strptime(expiry_date, "%Y-%m-%d").date()
 
     def is_expired(self):
-        return datetime.now().date() > self.expiry_date
+        return date.today() > self.expiry_date
 
     def __str__(self):
+        # The expiry status depends on today's date, so only the stable prefix is cached.
+        if self._str_cache is None:
+            self._str_cache = super().__str__() + f", Expires: {self.expiry_date}"
         status = "EXPIRED" if self.is_expired() else "Valid"
-        return super().__str__() + f", Expires: {self.expiry_date} ({status})"
+        return f"{self._str_cache} ({status})"
 
     def to_dict(self):
-        return {
-            "type": "Grocery",
-            "product_id": self._product_id,
-            "name": self._name,
-            "price": self._price,
-            "quantity": self._quantity_in_stock,
-            "expiry_date": self.expiry_date.isoformat()
-        }
+        d = self._base_dict()
+        d["expiry_date"] = self.expiry_date.isoformat()
+        return d
 
     @classmethod
     def from_dict(cls, data):
-        return cls(data["product_id"], data["name"], data["price"], data["quantity"], data["expiry_date"])
+        return cls(*_GET_GROCERY(data))
 
 
 class Clothing(Product):
+    __slots__ = ("size", "material")
+
     def __init__(self, product_id, name, price, quantity, size, material):
-        super().__init__(product_id, name, price, quantity)
-        self.size = size
-        self.material = material
+        self._product_id = product_id
+        self._name = name
+        self._price = price
+        self._quantity_in_stock = quantity
+        self._str_cache = None
+        self.size = sys.intern(size)
+        self.material = sys.intern(material)
 
     def __str__(self):
-        return super().__str__() + f", Size: {self.size}, Material: {self.material}"
+        if self._str_cache is None:
+            self._str_cache = super().__str__() + f", Size: {self.size}, Material: {self.material}"
+        return self._str_cache
 
     def to_dict(self):
-        return {
-            "type": "Clothing",
-            "product_id": self._product_id,
-            "name": self._name,
-            "price": self._price,
-            "quantity": self._quantity_in_stock,
-            "size": self.size,
-            "material": self.material
-        }
+        d = self._base_dict()
+        d["size"] = self.size
+        d["material"] = self.material
+        return d
 
     @classmethod
     def from_dict(cls, data):
-        return cls(data["product_id"], data["name"], data["price"], data["quantity"], data["size"], data["material"])
+        return cls(*_GET_CLOTHING(data))
+
+
+_MISSING = object()
+
+_FROM_DICT = {
+    "Electronics": Electronics.from_dict,
+    "Grocery": Grocery.from_dict,
+    "Clothing": Clothing.from_dict,
+}
 
 
 # --- Inventory Manager ---
 class Inventory:
     def __init__(self):
         self._products: Dict[str, Product] = {}
+        self._name_lower: Dict[str, str] = {}
+        self._by_type: Dict[str, Dict[str, Product]] = {}
+        self._expiry_heap: List[tuple] = []
+        if np is not None:
+            # Structure-of-arrays mirror of price/quantity for vectorized totals.
+            self._row_index: Dict[str, int] = {}
+            self._row_pids: List[str] = []
+            self._prices = np.empty(16, dtype=np.float64)
+            self._qtys = np.empty(16, dtype=np.int64)
+            self._n = 0
+
+    def _append_row(self, product: Product):
+        if self._n == len(self._prices):
+            new_cap = int(len(self._prices) * 1.5) + 1
+            self._prices = np.resize(self._prices, new_cap)
+            self._qtys = np.resize(self._qtys, new_cap)
+        self._prices[self._n] = product._price
+        self._qtys[self._n] = product._quantity_in_stock
+        self._row_index[product._product_id] = self._n
+        self._row_pids.append(product._product_id)
+        self._n += 1
+
+    def _remove_row(self, product_id):
+        # Swap-delete: move the last row into the freed slot to keep rows dense.
+        row = self._row_index.pop(product_id)
+        last = self._n - 1
+        if row != last:
+            last_pid = self._row_pids[last]
+            self._prices[row] = self._prices[last]
+            self._qtys[row] = self._qtys[last]
+            self._row_pids[row] = last_pid
+            self._row_index[last_pid] = row
+        self._row_pids.pop()
+        self._n = last
 
     def add_product(self, product: Product):
-        if product._product_id in self._products:
-            raise DuplicateProductIDError(f"Product ID {product._product_id} already exists.")
-        self._products[product._product_id] = product
+        pid = product._product_id
+        # setdefault + length check: one hash lookup instead of membership + insert.
+        n_before = len(self._products)
+        self._products.setdefault(pid, product)
+        if len(self._products) == n_before:
+            raise DuplicateProductIDError(f"Product ID {pid} already exists.")
+        self._name_lower[pid] = product._name.lower()
+        self._by_type.setdefault(type(product).__name__.lower(), {})[pid] = product
+        if isinstance(product, Grocery):
+            heapq.heappush(self._expiry_heap, (product.expiry_date, pid))
+        if np is not None:
+            self._append_row(product)
 
     def remove_product(self, product_id):
-        if product_id not in self._products:
+        product = self._products.pop(product_id, _MISSING)
+        if product is _MISSING:
             raise ProductNotFoundError(f"Product ID {product_id} not found.")
-        del self._products[product_id]
+        del self._name_lower[product_id]
+        self._by_type[type(product).__name__.lower()].pop(product_id, None)
+        if np is not None:
+            self._remove_row(product_id)
 
     def search_by_name(self, name):
-        return [p for p in self._products.values() if name.lower() in p._name.lower()]
+        query = name.lower()
+        return [self._products[pid] for pid, low in self._name_lower.items() if query in low]
 
     def search_by_type(self, product_type):
-        return [p for p in self._products.values() if p.__class__.__name__.lower() == product_type.lower()]
+        return list(self._by_type.get(product_type.lower(), {}).values())
 
     def list_all_products(self):
         return list(self._products.values())
@@ -151,44 +279,155 @@ class Inventory:
         if not product:
             raise ProductNotFoundError()
         product.sell(quantity)
+        if np is not None:
+            self._qtys[self._row_index[product_id]] = product._quantity_in_stock
 
     def restock_product(self, product_id, quantity):
         product = self._products.get(product_id)
         if not product:
             raise ProductNotFoundError()
         product.restock(quantity)
+        if np is not None:
+            self._qtys[self._row_index[product_id]] = product._quantity_in_stock
 
     def total_inventory_value(self):
+        if np is not None:
+            if _total_value is not None:
+                return float(_total_value(self._prices, self._qtys, self._n))
+            return float(np.dot(self._prices[:self._n], self._qtys[:self._n]))
         return sum(p.get_total_value() for p in self._products.values())
 
     def remove_expired_products(self):
-        expired_ids = [pid for pid, p in self._products.items() if isinstance(p, Grocery) and p.is_expired()]
-        for pid in expired_ids:
+        today = date.today()
+        while self._expiry_heap and self._expiry_heap[0][0] < today:
+            expiry_date, pid = heapq.heappop(self._expiry_heap)
+            product = self._products.get(pid)
+            # Skip stale heap entries: the product was removed (or replaced) since push.
+            if not isinstance(product, Grocery) or product.expiry_date != expiry_date:
+                continue
             del self._products[pid]
+            del self._name_lower[pid]
+            self._by_type.get("grocery", {}).pop(pid, None)
+            if np is not None:
+                self._remove_row(pid)
 
     def save_to_file(self, filename):
-        data = [p.to_dict() for p in self._products.values()]
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=4)
+        if filename.endswith(".msgpack"):
+            if msgpack is None:
+                raise InventoryError("msgpack is not installed; cannot write .msgpack files.")
+            data = [p.to_dict() for p in self._products.values()]
+            with open(filename, "wb") as f:
+                f.write(msgpack.packb(data, use_bin_type=True))
+            return
+        # Stream one product at a time so peak memory stays O(1) instead of O(N).
+        dumps = orjson.dumps if orjson is not None else lambda d: json.dumps(d).encode()
+        with open(filename, "wb") as f:
+            f.write(b"[")
+            first = True
+            for p in self._products.values():
+                if not first:
+                    f.write(b",")
+                f.write(dumps(p.to_dict()))
+                first = False
+            f.write(b"]")
 
     def load_from_file(self, filename):
-        with open(filename, "r") as f:
-            data = json.load(f)
-
-        product_map = {
-            "Electronics": Electronics,
-            "Grocery": Grocery,
-            "Clothing": Clothing
-        }
+        with open(filename, "rb") as f:
+            raw = f.read()
+        if filename.endswith(".msgpack"):
+            if msgpack is None:
+                raise InventoryError("msgpack is not installed; cannot read .msgpack files.")
+            data = msgpack.unpackb(raw, raw=False)
+        elif _simdjson_parser is not None:
+            data = _simdjson_parser.parse(raw)
+        elif orjson is not None:
+            data = orjson.loads(raw)
+        else:
+            data = json.loads(raw)
 
         self._products.clear()
+        self._name_lower.clear()
+        self._by_type.clear()
+        self._expiry_heap.clear()
+        if np is not None:
+            self._row_index.clear()
+            self._row_pids.clear()
+            self._n = 0
         for item in data:
+            if simdjson is not None and isinstance(item, simdjson.Object):
+                item = item.as_dict()
             ptype = item.get("type")
-            cls = product_map.get(ptype)
-            if not cls:
+            from_dict = _FROM_DICT.get(ptype)
+            if not from_dict:
                 raise InvalidProductDataError(f"Unknown product type: {ptype}")
-            product = cls.from_dict(item)
-            self._products[product._product_id] = product
+            pid = item["product_id"]
+            product = from_dict(item)
+            self._products[pid] = product
+            self._name_lower[pid] = product._name.lower()
+            self._by_type.setdefault(ptype.lower(), {})[pid] = product
+            if isinstance(product, Grocery):
+                heapq.heappush(self._expiry_heap, (product.expiry_date, pid))
+            if np is not None:
+                self._append_row(product)
+
+
+# --- Batch Mode ---
+def batch(script_lines):
+    """Run a compact command script non-interactively, e.g.:
+
+        ADD Electronics E1 "USB Hub" 19.99 10 Anker 2
+        ADD Grocery G1 Milk 2.50 5 2030-01-01
+        SELL E1 2
+        SAVE inventory.json
+    """
+    inventory = Inventory()
+
+    for lineno, line in enumerate(script_lines, 1):
+        tokens = shlex.split(line, comments=True)
+        if not tokens:
+            continue
+        cmd = tokens[0].upper()
+
+        try:
+            if cmd == "ADD":
+                ptype = tokens[1].lower()
+                pid, name = tokens[2], tokens[3]
+                price, qty = float(tokens[4]), int(tokens[5])
+
+                if ptype == "electronics":
+                    product = Electronics(pid, name, price, qty, tokens[6], int(tokens[7]))
+                elif ptype == "grocery":
+                    product = Grocery(pid, name, price, qty, tokens[6])
+                elif ptype == "clothing":
+                    product = Clothing(pid, name, price, qty, tokens[6], tokens[7])
+                else:
+                    raise InvalidProductDataError(f"Unknown product type: {tokens[1]}")
+                inventory.add_product(product)
+
+            elif cmd == "SELL":
+                inventory.sell_product(tokens[1], int(tokens[2]))
+            elif cmd == "RESTOCK":
+                inventory.restock_product(tokens[1], int(tokens[2]))
+            elif cmd == "REMOVE":
+                inventory.remove_product(tokens[1])
+            elif cmd == "EXPIRE":
+                inventory.remove_expired_products()
+            elif cmd == "VALUE":
+                print("Total Inventory Value: $%.2f" % inventory.total_inventory_value())
+            elif cmd == "LIST":
+                for p in inventory.list_all_products():
+                    print(p)
+            elif cmd == "SAVE":
+                inventory.save_to_file(tokens[1])
+            elif cmd == "LOAD":
+                inventory.load_from_file(tokens[1])
+            else:
+                print(f"Line {lineno}: unknown command: {tokens[0]}")
+
+        except (InventoryError, ValueError, IndexError) as e:
+            print(f"Line {lineno}: error: {e}")
+
+    return inventory
 
 
 # --- CLI Menu ---
@@ -293,4 +532,7 @@ def cli():
             print(f"Unexpected error: {e}")
 
 if __name__ == "__main__":
-    cli()
+    if sys.argv[1:] == ["--batch"]:
+        batch(sys.stdin.read().splitlines())
+    else:
+        cli()